@@ -10,26 +10,28 @@ Usage examples:
     python adk_agent.py --task full --lang javascript --city London
 """
 
+import io
 import os
 import sys
 import argparse
 import logging
 import subprocess
 import json
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from log_pipeline import configure_logging, log_event
+from renderers import RENDERERS, ReportRenderer, TextRenderer, make_renderer
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (LOG_MODE / LOG_FORMAT / LOG_SAMPLE, see log_pipeline.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -61,7 +63,8 @@ class FastMCPClient:
         Returns:
             Tool response data
         """
-        logger.info(f"Calling FastMCP tool: {tool_name} with args: {arguments}")
+        logger.debug("Calling FastMCP tool: %s with args: %s", tool_name, arguments)
+        started = time.perf_counter()
         
         try:
             # Import the actual tool function from mcp_server
@@ -73,11 +76,9 @@ class FastMCPClient:
             if '.' not in sys.path:
                 sys.path.insert(0, '.')
             
-            # Import or reload the mcp_server module
-            if 'mcp_server' in sys.modules:
-                mcp_server = importlib.reload(sys.modules['mcp_server'])
-            else:
-                import mcp_server
+            # Import the mcp_server module once; reloading it would discard
+            # the server's result cache and restart its prefetch scheduler
+            mcp_server = importlib.import_module('mcp_server')
             
             # Get the tool (it's a FunctionTool object from FastMCP)
             tool = getattr(mcp_server, tool_name)
@@ -96,7 +97,11 @@ class FastMCPClient:
             # Call the function
             result = tool_func(**arguments)
             
-            logger.info(f"Tool {tool_name} executed successfully")
+            latency_ms = round((time.perf_counter() - started) * 1000, 3)
+            log_event(
+                logger, "client_call", "Tool %s executed successfully in %.3f ms", tool_name, latency_ms,
+                tool=tool_name, latency_ms=latency_ms
+            )
             return result
             
         except AttributeError as e:
@@ -154,72 +159,31 @@ class ADKAgent:
             self.model = None
             logger.warning("Google API key not found, agent will work in basic mode")
     
+    def _render_text(self, render) -> str:
+        """Run render(renderer) against a TextRenderer and return the text."""
+        buffer = io.StringIO()
+        render(TextRenderer(buffer))
+        return buffer.getvalue()
+    
     def format_weather_response(self, weather_data: Dict[str, Any]) -> str:
         """Format weather data into a readable string."""
-        if not weather_data.get("success"):
-            return f"❌ Error: {weather_data.get('error', 'Unknown error')}"
-        
-        mock_note = " [Using mock data]" if weather_data.get("mock") else ""
-        country = f", {weather_data.get('country', '')}" if weather_data.get('country') else ""
-        
-        return f"""
-🌤️  Weather in {weather_data['city']}{country}{mock_note}:
-   Temperature: {weather_data['temperature']}°C (feels like {weather_data['feels_like']}°C)
-   Conditions: {weather_data['description'].title()}
-   Humidity: {weather_data['humidity']}%
-   Wind Speed: {weather_data['wind_speed']} m/s
-"""
+        return self._render_text(lambda renderer: renderer.weather(weather_data))
     
     def format_github_response(self, github_data: Dict[str, Any]) -> str:
         """Format GitHub trends data into a readable string."""
-        if not github_data.get("success"):
-            return f"❌ Error: {github_data.get('error', 'Unknown error')}"
-        
-        repos = github_data.get("repositories", [])
-        if not repos:
-            return "No repositories found."
-        
-        mock_note = " [Using mock data]" if github_data.get("mock") else ""
-        language = github_data.get("language", "Unknown")
-        
-        output = f"\n⭐ Top {len(repos)} Trending {language.title()} Repositories{mock_note}:\n\n"
-        
-        for i, repo in enumerate(repos, 1):
-            output += f"{i}. {repo['full_name']}\n"
-            output += f"   ⭐ {repo['stars']:,} stars | 🍴 {repo['forks']:,} forks\n"
-            output += f"   📝 {repo['description']}\n"
-            output += f"   🔗 {repo['url']}\n\n"
-        
-        return output
+        return self._render_text(lambda renderer: renderer.github(github_data))
     
     def format_news_response(self, news_data: Dict[str, Any]) -> str:
         """Format news data into a readable string."""
-        if not news_data.get("success"):
-            return f"❌ Error: {news_data.get('error', 'Unknown error')}"
-        
-        articles = news_data.get("articles", [])
-        if not articles:
-            return "No news headlines found."
-        
-        mock_note = " [Using mock data]" if news_data.get("mock") else ""
-        
-        output = f"\n📰 Top {len(articles)} News Headlines{mock_note}:\n\n"
-        
-        for i, article in enumerate(articles, 1):
-            output += f"{i}. {article['title']}\n"
-            output += f"   Source: {article['source']}\n"
-            output += f"   {article['description']}\n"
-            output += f"   🔗 {article['url']}\n\n"
-        
-        return output
+        return self._render_text(lambda renderer: renderer.news(news_data))
     
-    def execute_weather_task(self, city: str) -> str:
-        """Execute weather task using MCP tool."""
+    def run_weather_task(self, city: str, renderer: ReportRenderer) -> None:
+        """Run the weather task using MCP tool, writing sections to renderer."""
         logger.info(f"Executing weather task for city: {city}")
         
         try:
             weather_data = self.mcp_client.get_weather(city)
-            response = self.format_weather_response(weather_data)
+            renderer.weather(weather_data)
             
             if self.model and weather_data.get("success"):
                 try:
@@ -231,22 +195,20 @@ Humidity: {weather_data['humidity']}%
 Provide a brief, friendly comment about the weather and suggest appropriate clothing or activities."""
                     
                     ai_response = self.model.generate_content(prompt)
-                    response += f"\n💡 AI Insight: {ai_response.text}\n"
+                    renderer.insight("AI Insight", ai_response.text)
                 except Exception as e:
                     logger.error(f"Error getting AI insight: {str(e)}")
-            
-            return response
         except Exception as e:
             logger.error(f"Error executing weather task: {str(e)}")
-            return f"❌ Error: {str(e)}"
+            renderer.error("Weather", str(e))
     
-    def execute_trends_task(self, language: str, count: int = 5) -> str:
-        """Execute GitHub trends task using MCP tool."""
+    def run_trends_task(self, language: str, count: int, renderer: ReportRenderer) -> None:
+        """Run GitHub trends task using MCP tool, writing sections to renderer."""
         logger.info(f"Executing trends task for language: {language}, count: {count}")
         
         try:
             trends_data = self.mcp_client.get_github_trends(language, count)
-            response = self.format_github_response(trends_data)
+            renderer.github(trends_data)
             
             if self.model and trends_data.get("success"):
                 try:
@@ -262,22 +224,20 @@ Description: {top_repo['description']}
 Provide a brief insight about why this might be trending and what developers might learn from it."""
                         
                         ai_response = self.model.generate_content(prompt)
-                        response += f"\n💡 AI Insight: {ai_response.text}\n"
+                        renderer.insight("AI Insight", ai_response.text)
                 except Exception as e:
                     logger.error(f"Error getting AI insight: {str(e)}")
-            
-            return response
         except Exception as e:
             logger.error(f"Error executing trends task: {str(e)}")
-            return f"❌ Error: {str(e)}"
+            renderer.error("GitHub Trends", str(e))
     
-    def execute_news_task(self, count: int = 3, query: Optional[str] = None) -> str:
-        """Execute news task using MCP tool."""
+    def run_news_task(self, count: int, query: Optional[str], renderer: ReportRenderer) -> None:
+        """Run news task using MCP tool, writing sections to renderer."""
         logger.info(f"Executing news task, count: {count}, query: {query}")
         
         try:
             news_data = self.mcp_client.get_news(count, query)
-            response = self.format_news_response(news_data)
+            renderer.news(news_data)
             
             if self.model and news_data.get("success"):
                 try:
@@ -290,47 +250,37 @@ Provide a brief insight about why this might be trending and what developers mig
 Provide a brief summary of the common themes or key takeaways."""
                     
                     ai_response = self.model.generate_content(prompt)
-                    response += f"\n💡 AI Summary: {ai_response.text}\n"
+                    renderer.insight("AI Summary", ai_response.text)
                 except Exception as e:
                     logger.error(f"Error getting AI summary: {str(e)}")
-            
-            return response
         except Exception as e:
             logger.error(f"Error executing news task: {str(e)}")
-            return f"❌ Error: {str(e)}"
+            renderer.error("News", str(e))
     
-    def execute_full_task(self, language: str, city: str, repo_count: int = 3, news_count: int = 3) -> str:
-        """Execute comprehensive task combining all MCP tools."""
+    def run_full_task(self, language: str, city: str, renderer: ReportRenderer,
+                      repo_count: int = 3, news_count: int = 3) -> None:
+        """Run comprehensive task combining all MCP tools, writing each section as it completes."""
         logger.info(f"Executing full task: language={language}, city={city}")
         
-        output = f"\n{'='*80}\n"
-        output += f"📊 COMPREHENSIVE REPORT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        output += f"{'='*80}\n"
+        renderer.begin_report("COMPREHENSIVE REPORT", datetime.now())
         
         # Get weather using MCP tool
         try:
-            weather_data = self.mcp_client.get_weather(city)
-            output += self.format_weather_response(weather_data)
+            renderer.weather(self.mcp_client.get_weather(city))
         except Exception as e:
-            output += f"\n❌ Weather Error: {str(e)}\n"
-        
-        output += f"\n{'-'*80}\n"
+            renderer.error("Weather", str(e))
         
         # Get GitHub trends using MCP tool
         try:
-            trends_data = self.mcp_client.get_github_trends(language, repo_count)
-            output += self.format_github_response(trends_data)
+            renderer.github(self.mcp_client.get_github_trends(language, repo_count))
         except Exception as e:
-            output += f"\n❌ GitHub Trends Error: {str(e)}\n"
-        
-        output += f"\n{'-'*80}\n"
+            renderer.error("GitHub Trends", str(e))
         
         # Get news using MCP tool
         try:
-            news_data = self.mcp_client.get_news(news_count)
-            output += self.format_news_response(news_data)
+            renderer.news(self.mcp_client.get_news(news_count))
         except Exception as e:
-            output += f"\n❌ News Error: {str(e)}\n"
+            renderer.error("News", str(e))
         
         # Use Gemini to create an intelligent summary
         if self.model:
@@ -344,14 +294,29 @@ Provide a brief summary of the common themes or key takeaways."""
 Provide 2-3 sentences about interesting connections or insights."""
                 
                 ai_response = self.model.generate_content(prompt)
-                output += f"\n{'-'*80}\n"
-                output += f"\n🤖 AI-Powered Insights:\n{ai_response.text}\n"
+                renderer.insight("AI-Powered Insights", ai_response.text)
             except Exception as e:
                 logger.error(f"Error generating comprehensive summary: {str(e)}")
         
-        output += f"\n{'='*80}\n"
-        
-        return output
+        renderer.end_report()
+    
+    def execute_weather_task(self, city: str) -> str:
+        """Execute weather task using MCP tool and return the text report."""
+        return self._render_text(lambda renderer: self.run_weather_task(city, renderer))
+    
+    def execute_trends_task(self, language: str, count: int = 5) -> str:
+        """Execute GitHub trends task using MCP tool and return the text report."""
+        return self._render_text(lambda renderer: self.run_trends_task(language, count, renderer))
+    
+    def execute_news_task(self, count: int = 3, query: Optional[str] = None) -> str:
+        """Execute news task using MCP tool and return the text report."""
+        return self._render_text(lambda renderer: self.run_news_task(count, query, renderer))
+    
+    def execute_full_task(self, language: str, city: str, repo_count: int = 3, news_count: int = 3) -> str:
+        """Execute comprehensive task combining all MCP tools and return the text report."""
+        return self._render_text(
+            lambda renderer: self.run_full_task(language, city, renderer, repo_count, news_count)
+        )
 
 
 # ============================================================================
@@ -376,6 +341,9 @@ Examples:
   
   # Comprehensive report combining all tools
   python adk_agent.py --task full --lang javascript --city London
+  
+  # Machine-readable output (one JSON object per section)
+  python adk_agent.py --task full --output jsonl
         """
     )
     
@@ -406,59 +374,70 @@ Examples:
         action="store_true",
         help="Disable AI-powered insights"
     )
+    parser.add_argument(
+        "--output",
+        default="text",
+        choices=sorted(RENDERERS),
+        help="Output format: human-readable text, a JSON document, or JSON lines (default: text)"
+    )
     
     args = parser.parse_args()
     
+    # Status lines are only for humans; keep machine-readable stdout clean
+    text_output = args.output == "text"
+    
     # Initialize FastMCP client
-    print("\n🔍 Initializing FastMCP client...")
+    if text_output:
+        print("\n🔍 Initializing FastMCP client...")
     mcp_client = FastMCPClient()
     
     # Check MCP server tools
-    print("✅ FastMCP client initialized\n")
+    if text_output:
+        print("✅ FastMCP client initialized\n")
     
     # Initialize ADK agent
     google_api_key = None if args.no_ai else os.getenv("GOOGLE_API_KEY")
     agent = ADKAgent(mcp_client, google_api_key)
     
+    # Sections are written to stdout as each one completes
+    renderer = make_renderer(args.output, sys.stdout)
+    
     # Execute task
     try:
         if args.task == "info":
-            info = mcp_client.get_server_info()
-            print("📋 MCP Server Information:")
-            print(f"   Name: {info.get('name')}")
-            print(f"   Version: {info.get('version')}")
-            print(f"   Tools: {', '.join(info.get('tools', []))}")
-            print(f"   Status: {info.get('status')}")
-            print(f"\n🔑 API Keys Configured:")
-            for key, value in info.get('api_keys_configured', {}).items():
-                status = "✅" if value else "❌"
-                print(f"   {status} {key}")
+            renderer.server_info(mcp_client.get_server_info())
         elif args.task == "weather":
-            result = agent.execute_weather_task(args.city)
-            print(result)
+            agent.run_weather_task(args.city, renderer)
         elif args.task == "trends":
-            result = agent.execute_trends_task(args.lang, args.count)
-            print(result)
+            agent.run_trends_task(args.lang, args.count, renderer)
         elif args.task == "news":
-            result = agent.execute_news_task(args.count)
-            print(result)
+            agent.run_news_task(args.count, None, renderer)
         elif args.task == "full":
-            result = agent.execute_full_task(
+            agent.run_full_task(
                 language=args.lang,
                 city=args.city,
+                renderer=renderer,
                 repo_count=min(args.count, 5),
                 news_count=3
             )
-            print(result)
         
+        renderer.close()
         logger.info("Task completed successfully")
         
     except KeyboardInterrupt:
-        print("\n\n⚠️  Task interrupted by user")
+        if text_output:
+            print("\n\n⚠️  Task interrupted by user")
+        else:
+            renderer.error("Agent", "Task interrupted by user")
+            renderer.close()
         sys.exit(0)
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}")
-        print(f"\n❌ Fatal error: {str(e)}")
+        if text_output:
+            print(f"\n❌ Fatal error: {str(e)}")
+        else:
+            renderer.error("Fatal", str(e))
+            renderer.close()
         sys.exit(1)
 
 
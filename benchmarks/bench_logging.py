@@ -0,0 +1,111 @@
+"""
+Logging Overhead Benchmark
+==========================
+Measures the per-call cost of the log lines emitted on a tool call hot path
+(request, upstream success and completion lines) under each logging mode.
+
+"caller us/call" is the time spent on the request thread; "total us/call"
+also includes draining the background writer. Output goes to a temporary
+file so terminal speed does not skew results; with a slow stderr (a busy
+terminal or log collector) the gap between caller and total time widens in
+favour of async mode. Each mode reports the fastest of --repeat runs; runs
+are interleaved across modes so background load affects them all alike.
+
+Run with: python benchmarks/bench_logging.py [--calls 50000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import TEXT_FORMAT, configure_logging, log_event, reset_logging, shutdown_logging  # noqa: E402
+
+logger = logging.getLogger("bench")
+
+
+def eager_call(i: int) -> None:
+    """Log lines as the tools did before: f-strings formatted up front."""
+    city = f"city-{i % 50}"
+    logger.info(f"Weather tool called for city: {city}")
+    logger.info(f"Weather data retrieved successfully for {city}")
+    logger.info(f"Tool get_weather completed in {0.123:.3f} ms (cache hit)")
+
+
+def lazy_call(i: int) -> None:
+    """Log lines as the tools do now: log_event() with %-style arguments and fields."""
+    city = f"city-{i % 50}"
+    log_event(logger, "tool_request", "Weather tool called for city: %s", city, tool="get_weather")
+    log_event(logger, "upstream_ok", "Weather data retrieved successfully for %s", city, tool="get_weather")
+    log_event(
+        logger, "tool_call", "Tool %s completed in %.3f ms (cache %s)", "get_weather", 0.123, "hit",
+        tool="get_weather", latency_ms=0.123, cache="hit"
+    )
+
+
+SCENARIOS = [
+    # (label, call function, configure_logging kwargs or None for the old basicConfig setup)
+    ("basicConfig, f-strings (before)", eager_call, None),
+    ("sync text, log_event (default)", lazy_call, {"mode": "sync", "fmt": "text", "sample": ""}),
+    ("async text", lazy_call, {"mode": "async", "fmt": "text", "sample": ""}),
+    ("async json", lazy_call, {"mode": "async", "fmt": "json", "sample": ""}),
+    ("sync text, sampled 1%", lazy_call,
+     {"mode": "sync", "fmt": "text", "sample": "tool_request=0.01,upstream_ok=0.01,tool_call=0.01"}),
+    ("async json, sampled 1%", lazy_call,
+     {"mode": "async", "fmt": "json", "sample": "tool_request=0.01,upstream_ok=0.01,tool_call=0.01"}),
+    ("INFO disabled, f-strings", eager_call, {"level": "WARNING", "mode": "sync", "fmt": "text", "sample": ""}),
+    ("INFO disabled, log_event", lazy_call, {"level": "WARNING", "mode": "sync", "fmt": "text", "sample": ""}),
+]
+
+
+def run_scenario(call, calls: int, options: Optional[dict]) -> tuple:
+    """Return (caller seconds, total seconds, bytes written)."""
+    with tempfile.TemporaryFile("w+") as sink:
+        reset_logging()
+        if options is None:
+            logging.basicConfig(level=logging.INFO, format=TEXT_FORMAT, stream=sink)
+        else:
+            configure_logging(stream=sink, **{"level": "INFO", **options})
+
+        started = time.perf_counter()
+        for i in range(calls):
+            call(i)
+        caller = time.perf_counter() - started
+        shutdown_logging()
+        total = time.perf_counter() - started
+
+        sink.flush()
+        written = sink.tell()
+    reset_logging()
+    return caller, total, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-call logging overhead")
+    parser.add_argument("--calls", type=int, default=50000, help="Tool calls to simulate (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the fastest is reported (default: 3)")
+    args = parser.parse_args()
+
+    print(f"Simulating {args.calls:,} tool calls (3 log lines each)\n")
+    print(f"{'mode':<32} {'caller us/call':>15} {'total us/call':>15} {'calls/s (caller)':>17} {'KiB written':>12}")
+    print("-" * 95)
+    best = {}
+    for _ in range(args.repeat):
+        for label, call, options in SCENARIOS:
+            result = run_scenario(call, args.calls, options)
+            best[label] = min(best.get(label, result), result)
+    for label, _, _ in SCENARIOS:
+        caller, total, written = best[label]
+        print(
+            f"{label:<32} {caller / args.calls * 1e6:>15.2f} {total / args.calls * 1e6:>15.2f} "
+            f"{args.calls / caller:>17,.0f} {written / 1024:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
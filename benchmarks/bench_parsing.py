@@ -0,0 +1,125 @@
+"""
+Response Parsing Benchmark
+==========================
+Compares peak memory and parse time of the old full-body path
+(read whole body, json.loads, slice items) against json_stream's
+incremental reader on a synthetic GitHub search response.
+
+The body is fed as chunks, as requests' iter_content() would, and the
+full-body path joins them first, as Response.content does.
+
+Run with: python benchmarks/bench_parsing.py [--per-page 100]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_stream import iter_json_array  # noqa: E402
+
+CHUNK_SIZE = 16 * 1024
+
+FIELDS = ("name", "full_name", "description", "stargazers_count", "forks_count",
+          "language", "html_url", "created_at", "updated_at")
+
+
+def make_repo(i: int) -> dict:
+    """Build a search item shaped like the GitHub API's (about 6 KB of JSON)."""
+    owner = {
+        "login": f"owner{i}", "id": 1000 + i, "node_id": "MDQ6VXNlcjE=" * 2,
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{1000 + i}?v=4",
+        "gravatar_id": "", "type": "User", "site_admin": False
+    }
+    owner.update({
+        f"{name}_url": f"https://api.github.com/users/owner{i}/{name}"
+        for name in ("html", "followers", "following", "gists", "starred", "subscriptions",
+                     "organizations", "repos", "events", "received_events")
+    })
+    repo = {
+        "id": 10_000 + i, "node_id": "MDEwOlJlcG9zaXRvcnkx" * 2, "name": f"project-{i}",
+        "full_name": f"owner{i}/project-{i}", "private": False, "owner": owner,
+        "html_url": f"https://github.com/owner{i}/project-{i}",
+        "description": f"A widely used project number {i} " * 3, "fork": False,
+        "created_at": "2015-01-01T00:00:00Z", "updated_at": "2024-06-01T00:00:00Z",
+        "pushed_at": "2024-06-01T00:00:00Z", "homepage": f"https://project-{i}.dev",
+        "size": 50_000 + i, "stargazers_count": 200_000 - i * 10, "watchers_count": 200_000 - i * 10,
+        "language": "Python", "forks_count": 30_000 - i, "open_issues_count": 1000 + i,
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT",
+                    "url": "https://api.github.com/licenses/mit", "node_id": "MDc6TGljZW5zZTEz"},
+        "topics": ["python", "framework", "web", "api", "async", "http"],
+        "visibility": "public", "default_branch": "main", "score": 1.0
+    }
+    repo.update({
+        f"{name}_url": f"https://api.github.com/repos/owner{i}/project-{i}/{name}"
+        for name in ("forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events",
+                     "assignees", "branches", "tags", "blobs", "git_tags", "git_refs", "trees",
+                     "statuses", "languages", "stargazers", "contributors", "subscribers",
+                     "subscription", "commits", "git_commits", "comments", "issue_comment",
+                     "contents", "compare", "merges", "archive", "downloads", "issues", "pulls",
+                     "milestones", "notifications", "labels", "releases", "deployments")
+    })
+    return repo
+
+
+def full_body(chunks, count: int) -> list:
+    """Old path: buffer the whole body, parse everything, keep `count` items."""
+    data = json.loads(b"".join(chunks))
+    return [{field: repo[field] for field in FIELDS} for repo in data.get("items", [])[:count]]
+
+
+def streamed(chunks, count: int) -> list:
+    """New path: parse items incrementally and stop after `count`."""
+    return [{field: repo[field] for field in FIELDS} for repo in iter_json_array(chunks, "items", limit=count)]
+
+
+def measure(parse, body: bytes, count: int, repeat: int) -> tuple:
+    """Return (best seconds, peak bytes, chunks read) for one parse strategy."""
+    best = float("inf")
+    for _ in range(repeat):
+        chunks = (body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+        started = time.perf_counter()
+        parse(chunks, count)
+        best = min(best, time.perf_counter() - started)
+
+    read = 0
+
+    def counted():
+        nonlocal read
+        for i in range(0, len(body), CHUNK_SIZE):
+            read += 1
+            yield body[i:i + CHUNK_SIZE]
+
+    tracemalloc.start()
+    parse(counted(), count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, read
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-body vs streamed response parsing")
+    parser.add_argument("--per-page", type=int, default=100, help="Items in the response body (default: 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per case; fastest is reported (default: 5)")
+    args = parser.parse_args()
+
+    body = json.dumps({
+        "total_count": 1_234_567, "incomplete_results": False,
+        "items": [make_repo(i) for i in range(args.per_page)]
+    }).encode("utf-8")
+    total_chunks = -(-len(body) // CHUNK_SIZE)
+    print(f"Body: {args.per_page} items, {len(body) / 1024:,.0f} KiB, {total_chunks} chunks of {CHUNK_SIZE // 1024} KiB\n")
+    print(f"{'count':>5}  {'strategy':<10} {'parse ms':>9} {'peak KiB':>9} {'chunks read':>12}")
+    print("-" * 51)
+    for count in sorted({min(5, args.per_page), min(20, args.per_page), args.per_page}):
+        for label, parse in (("full body", full_body), ("streamed", streamed)):
+            seconds, peak, read = measure(parse, body, count, args.repeat)
+            print(f"{count:>5}  {label:<10} {seconds * 1000:>9.2f} {peak / 1024:>9,.0f} {read:>12}")
+
+
+if __name__ == "__main__":
+    main()
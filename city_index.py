@@ -0,0 +1,219 @@
+"""
+City Name Index
+===============
+Resolves free-form city input ("delhi", "Delhi ", "New Delhi", "Delhi,IN")
+to a canonical OpenWeather city ID so weather queries and cache keys are
+issued by ID instead of raw strings.
+
+The bundled index (data/city_index.tsv) is a sorted, tab-separated file:
+
+    <normalized key> \\t <city id> \\t <canonical name> \\t <country code>
+
+One line per name or alias, sorted by key. The file is memory-mapped and
+searched in place with a byte-level binary search, so lookups never load
+it into the Python heap and worker processes share the same page cache.
+
+resolve() only accepts exact (case-folded, accent-stripped) names and
+aliases, so real cities missing from the index are never rewritten into a
+different one. suggest() adds unambiguous-prefix and fuzzy matching and is
+meant as a fallback once the upstream name lookup has failed.
+"""
+
+import difflib
+import logging
+import mmap
+import os
+import re
+import unicodedata
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "city_index.tsv")
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+class CityMatch(NamedTuple):
+    """A resolved city."""
+    city_id: int
+    name: str
+    country: str
+    match: str  # "exact", "prefix" or "fuzzy"
+
+
+def normalize_city(text: str) -> str:
+    """Case-fold, strip accents and punctuation, and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def split_country(text: str) -> Tuple[str, Optional[str]]:
+    """Split "Delhi,IN" style input into (city, country code)."""
+    city, sep, country = text.rpartition(",")
+    country = country.strip()
+    if sep and city.strip() and len(country) == 2 and country.isalpha():
+        return city, country.upper()
+    return text, None
+
+
+def write_index(path: str, cities: Iterable[Tuple[int, str, str, Sequence[str]]]) -> int:
+    """
+    Write a sorted index file.
+
+    Args:
+        path: Destination file
+        cities: (city_id, canonical name, country code, aliases) tuples, most
+            important first; order is kept among cities sharing a key
+
+    Returns:
+        Number of lines written
+    """
+    rows = []
+    for rank, (city_id, name, country, aliases) in enumerate(cities):
+        for alias in {normalize_city(n) for n in (name, *aliases)}:
+            rows.append((alias.encode("utf-8"), rank, f"{city_id}\t{name}\t{country}"))
+    rows.sort(key=lambda row: (row[0], row[1]))
+
+    with open(path, "wb") as f:
+        for key, _, rest in rows:
+            f.write(key + b"\t" + rest.encode("utf-8") + b"\n")
+    return len(rows)
+
+
+class CityIndex:
+    """Memory-mapped, sorted city name index."""
+
+    # Upper bound on keys compared by the fuzzy step of suggest()
+    FUZZY_CANDIDATES = 256
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, fuzzy_cutoff: float = 0.8):
+        """
+        Open the index.
+
+        Args:
+            path: Index file written by write_index()
+            fuzzy_cutoff: Minimum similarity ratio for fuzzy matches (0-1)
+        """
+        self.path = path
+        self.fuzzy_cutoff = fuzzy_cutoff
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Unmap the index file."""
+        self._mm.close()
+
+    def _line_at(self, start: int) -> Tuple[bytes, int]:
+        """Return (line without newline, offset of the next line)."""
+        end = self._mm.find(b"\n", start)
+        if end == -1:
+            end = len(self._mm)
+        return self._mm[start:end], end + 1
+
+    def _lower_bound(self, target: bytes) -> int:
+        """Offset of the first line whose key is >= target."""
+        mm = self._mm
+        lo, hi = 0, len(mm)
+        while lo < hi:
+            start = mm.rfind(b"\n", 0, (lo + hi) // 2) + 1
+            line, next_start = self._line_at(start)
+            if line.partition(b"\t")[0] < target:
+                lo = next_start
+            else:
+                hi = start
+        return lo
+
+    def _scan(self, target: bytes, prefix: bool, limit: int = 64) -> List[Tuple[bytes, List[str]]]:
+        """Collect lines whose key equals (or starts with) target."""
+        rows = []
+        pos = self._lower_bound(target)
+        while pos < len(self._mm) and len(rows) < limit:
+            line, pos = self._line_at(pos)
+            key, _, rest = line.partition(b"\t")
+            if key != target and not (prefix and key.startswith(target)):
+                break
+            rows.append((key, rest.decode("utf-8").split("\t")))
+        return rows
+
+    @staticmethod
+    def _pick(rows: List[Tuple[bytes, List[str]]], country: Optional[str]) -> List[List[str]]:
+        fields = [f for _, f in rows]
+        if country:
+            fields = [f for f in fields if f[2] == country]
+        return fields
+
+    def resolve(self, text: str) -> Optional[CityMatch]:
+        """
+        Resolve free-form city input to a canonical city by exact name or alias.
+
+        Args:
+            text: City name, optionally suffixed with ",<country code>"
+
+        Returns:
+            CityMatch, or None if the name is not in the index
+        """
+        city, country = split_country(text)
+        key = normalize_city(city)
+        if not key:
+            return None
+
+        # The first row for a key is the most important city
+        exact = self._pick(self._scan(key.encode("utf-8"), prefix=False), country)
+        if exact:
+            return CityMatch(int(exact[0][0]), exact[0][1], exact[0][2], "exact")
+        return None
+
+    def suggest(self, text: str) -> Optional[CityMatch]:
+        """
+        Guess the intended city for input that resolve() did not match.
+
+        Tries an unambiguous prefix, then a fuzzy match among at most
+        FUZZY_CANDIDATES keys sharing the first two characters and of similar
+        length. Guesses can name a different real city, so only use them
+        after the name itself has been rejected upstream.
+
+        Args:
+            text: City name, optionally suffixed with ",<country code>"
+
+        Returns:
+            CityMatch, or None if nothing is close enough
+        """
+        city, country = split_country(text)
+        key = normalize_city(city)
+        if len(key) < 4:
+            return None
+        target = key.encode("utf-8")
+
+        # 1. Prefix match, only when every candidate is the same city
+        prefixed = self._pick(self._scan(target, prefix=True), country)
+        if prefixed and len({f[0] for f in prefixed}) == 1:
+            return CityMatch(int(prefixed[0][0]), prefixed[0][1], prefixed[0][2], "prefix")
+
+        # 2. Fuzzy match; a similarity ratio of r needs lengths within
+        # a factor of (2 - r) / r, so longer or shorter keys are skipped
+        max_ratio = (2 - self.fuzzy_cutoff) / self.fuzzy_cutoff
+        by_key: dict = {}
+        for k, f in self._scan(target[:2], prefix=True, limit=self.FUZZY_CANDIDATES):
+            name = k.decode("utf-8")
+            if country and f[2] != country:
+                continue
+            if max(len(name), len(key)) > max_ratio * min(len(name), len(key)):
+                continue
+            by_key.setdefault(name, []).append(f)
+        close = difflib.get_close_matches(key, list(by_key), n=1, cutoff=self.fuzzy_cutoff)
+        if close:
+            f = by_key[close[0]][0]
+            return CityMatch(int(f[0]), f[1], f[2], "fuzzy")
+        return None
+
+
+def load_city_index(path: Optional[str] = None) -> Optional[CityIndex]:
+    """Open the city index, or return None (with a warning) if unavailable."""
+    path = path or DEFAULT_INDEX_PATH
+    try:
+        return CityIndex(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"City index unavailable at {path}: {str(e)}")
+        return None
@@ -0,0 +1,141 @@
+"""
+Incremental JSON Array Reader
+=============================
+Streams the elements of one array inside a top-level JSON object, e.g. the
+"items" array of a GitHub search response or NewsAPI's "articles", from an
+iterator of byte chunks such as requests' Response.iter_content().
+
+Only one element (plus the unread tail of the current chunk) is decoded and
+held at a time, and reading stops as soon as `limit` elements have been
+produced, so the rest of the body is never downloaded or parsed.
+
+Built on json.JSONDecoder.raw_decode so it needs no extra dependency.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+_NUMBER_END = _WHITESPACE + ",]}"
+_decoder = json.JSONDecoder()
+
+
+class _ChunkBuffer:
+    """Text buffer fed lazily from an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False at end of input."""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.text = self.text[self.pos:] + self._utf8.decode(chunk)
+            self.pos = 0
+            return True
+        self.text = self.text[self.pos:] + self._utf8.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ("" at end of input)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume char (after whitespace) or raise JSONDecodeError."""
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.text, self.pos)
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+
+        A number is only accepted once the character after it has arrived
+        and ends it (whitespace, ",", "]" or "}"): raw_decode happily reads
+        "1" out of a chunk ending in "1." or "1e", and 12 might continue as
+        123. Failed attempts wait until the pending text has doubled, keeping
+        re-parsing of large values linear overall.
+        """
+        number = self.peek() in _NUMBER_START
+        while True:
+            pending = len(self.text) - self.pos
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                if self.eof or (end < len(self.text) and (not number or self.text[end] in _NUMBER_END)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            while len(self.text) - self.pos < pending * 2 and self.fill():
+                pass
+            if self.eof and len(self.text) - self.pos == pending:
+                # No more input; a final attempt either succeeds or raises
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                self.pos = end
+                return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str, limit: Optional[int] = None) -> Iterator[Any]:
+    """
+    Yield elements of the array stored under `key` in a top-level JSON object.
+
+    Args:
+        chunks: Byte chunks of the response body
+        key: Top-level key holding the array (e.g. "items" or "articles")
+        limit: Stop after this many elements (default: all)
+
+    Yields:
+        Decoded array elements, in order. Nothing is yielded if the key is
+        absent or its value is not an array.
+
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON
+    """
+    if limit is not None and limit <= 0:
+        return
+    buf = _ChunkBuffer(chunks)
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+
+    while True:
+        name = buf.decode_value()
+        buf.expect(":")
+
+        if name == key and buf.peek() == "[":
+            buf.pos += 1
+            produced = 0
+            if buf.peek() == "]":
+                return
+            while True:
+                yield buf.decode_value()
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+                if buf.peek() == "]":
+                    return
+                buf.expect(",")
+
+        # Skip values of other keys (small scalars in the responses we read)
+        buf.decode_value()
+        if buf.peek() == "}":
+            return
+        buf.expect(",")
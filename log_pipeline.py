@@ -0,0 +1,247 @@
+"""
+Logging Pipeline
+================
+Shared logging setup for mcp_server.py and adk_agent.py.
+
+Environment settings (see .env.example):
+- LOG_LEVEL: Root log level (default: INFO)
+- LOG_MODE: "sync" writes on the calling thread; "async" hands records to a
+  background writer thread through a queue (default: sync). Async only
+  helps when the log sink itself is slow to write to; the caller still
+  builds every LogRecord, and the writer thread competes for the GIL, so
+  with a fast sink it costs about the same as sync or more
+- LOG_FORMAT: "text" or "json" (one JSON object per line) (default: text)
+- LOG_SAMPLE: Per-event sampling rates, e.g. "tool_call=0.1,cache_hit=0.01"
+
+High-rate log lines go through log_event(). With the default sync text
+output and no LOG_SAMPLE it costs the same as the f-string logger calls it
+replaced. With LOG_FORMAT=json
+the event name and structured fields are attached to the record. With
+LOG_SAMPLE, sampling is decided before a LogRecord is built, so a dropped
+line costs only a level check and a counter increment. Sampling never
+drops WARNING and above.
+
+In async mode the message is not formatted on the calling thread: %-style
+arguments are kept on the record and interpolated by the writer thread.
+Records whose arguments are mutable (dicts, lists, objects) are formatted
+before being queued, so later mutations cannot leak into the log line.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Structured fields copied into JSON output when present on a record
+STRUCTURED_FIELDS = ("event", "tool", "latency_ms", "cache", "sample_rate")
+
+# Argument types that are safe to format later on the writer thread
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None), bytes)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configured = False
+_configure_lock = threading.Lock()
+_sampler: Optional["EventSampler"] = None
+# True for sync text output without sampling, where log_event() needs
+# neither its event name nor its fields
+_plain = True
+_structured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class EventSampler:
+    """
+    Keep 1 in N INFO/DEBUG lines per sampled event.
+
+    Sampling is deterministic (every N-th line passes) so low rates still
+    emit a steady trickle, and kept lines carry sample_rate so consumers
+    can re-weight counts.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        self.intervals = {
+            event: max(1, round(1.0 / rate)) for event, rate in rates.items() if rate > 0
+        }
+        self.dropped_events = {event for event, rate in rates.items() if rate <= 0}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def sample(self, event: str) -> Optional[float]:
+        """Return None to drop this line, else the rate it was sampled at."""
+        if event in self.dropped_events:
+            return None
+        interval = self.intervals.get(event)
+        if interval is None or interval == 1:
+            return 1.0
+        with self._lock:
+            seen = self._counters.get(event, 0)
+            self._counters[event] = seen + 1
+        if seen % interval:
+            return None
+        return 1.0 / interval
+
+
+def log_event(logger: logging.Logger, event: str, msg: str, *args: Any,
+              level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Log a high-rate line tagged with an event name and structured fields.
+
+    Args:
+        logger: Logger to emit on
+        event: Event name used for sampling and the JSON "event" field
+        msg: %-style message
+        *args: Message arguments, formatted lazily
+        level: Log level (default: INFO)
+        **fields: Structured fields such as tool or latency_ms
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if _plain:
+        # Same work as the f-string lines this replaced: the line is known to
+        # be enabled and is written on this thread anyway, so format it here
+        # (a pre-formatted record is cheaper than one carrying args). The
+        # fields have no consumer, and TEXT_FORMAT shows no caller location.
+        if args:
+            try:
+                msg = msg % args
+            except (TypeError, ValueError):
+                logger._log(level, msg, args)
+                return
+        logger._log(level, msg, ())
+        return
+    sampler = _sampler
+    if sampler is not None and level <= logging.INFO:
+        rate = sampler.sample(event)
+        if rate is None:
+            return
+        if rate < 1.0:
+            fields["sample_rate"] = rate
+    if _structured:
+        fields["event"] = event
+        logger._log(level, msg, args, extra=fields, stacklevel=2)
+    else:
+        logger._log(level, msg, args, stacklevel=2)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records unformatted.
+
+    The stock QueueHandler.prepare() formats the message on the calling
+    thread so records can be pickled; records here stay in-process, so
+    formatting is left to the writer thread unless an argument is mutable.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not (
+            isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "event=rate,event=rate" into a dict, ignoring malformed items."""
+    rates = {}
+    for item in spec.split(","):
+        event, sep, rate = item.partition("=")
+        if not sep:
+            continue
+        try:
+            rates[event.strip()] = min(1.0, float(rate))
+        except ValueError:
+            continue
+    return rates
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    mode: Optional[str] = None,
+    fmt: Optional[str] = None,
+    sample: Optional[str] = None,
+    stream=None
+) -> None:
+    """
+    Configure root logging once per process.
+
+    Arguments default to the LOG_* environment settings; later calls are
+    no-ops so both modules can call this at import time.
+    """
+    global _listener, _configured, _sampler, _plain, _structured
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+
+        level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+        mode = (mode or os.getenv("LOG_MODE", "sync")).lower()
+        fmt = (fmt or os.getenv("LOG_FORMAT", "text")).lower()
+        rates = parse_sample_rates(sample if sample is not None else os.getenv("LOG_SAMPLE", ""))
+
+        writer = logging.StreamHandler(stream or sys.stderr)
+        writer.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+        if mode == "async":
+            handler: logging.Handler = LazyQueueHandler(queue.SimpleQueue())
+            _listener = logging.handlers.QueueListener(handler.queue, writer, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        else:
+            handler = writer
+
+        _sampler = EventSampler(rates) if rates else None
+        _structured = fmt == "json"
+        _plain = _sampler is None and not _structured and mode != "async"
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def reset_logging() -> None:
+    """Remove handlers installed by configure_logging() so it can run again."""
+    global _configured, _sampler, _plain, _structured
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _sampler = None
+    _plain = True
+    _structured = False
+    _configured = False
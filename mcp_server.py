@@ -11,22 +11,27 @@ Or as MCP server: mcp run mcp_server.py
 """
 
 import os
+import time
+import sqlite3
 import logging
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 import requests
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 
+from city_index import CityMatch, load_city_index
+from json_stream import iter_json_array
+from log_pipeline import configure_logging, log_event
+from prefetch import PrefetchScheduler, TTLCache, make_key, parse_warm_list
+from result_store import open_result_store
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (LOG_MODE / LOG_FORMAT / LOG_SAMPLE, see log_pipeline.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Initialize FastMCP server
@@ -37,6 +42,18 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
 
+# Chunk size for streamed upstream responses (bytes)
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Memory-mapped city name index used to canonicalize weather queries
+CITY_INDEX_PATH = os.getenv("CITY_INDEX_PATH", "")
+_city_index = load_city_index(CITY_INDEX_PATH or None)
+
+# Names OpenWeather answered 404 for -> the index suggestion that worked, so
+# repeat queries (and prefetch refreshes) go straight to the city ID
+_weather_suggestions: Dict[str, CityMatch] = {}
+_MAX_WEATHER_SUGGESTIONS = 1024
+
 
 # ============================================================================
 # Tool 1: Weather Tool
@@ -54,8 +71,26 @@ def get_weather(city: str) -> dict:
         Dictionary containing weather information including temperature,
         humidity, wind speed, and weather description
     """
-    logger.info(f"Weather tool called for city: {city}")
+    log_event(logger, "tool_request", "Weather tool called for city: %s", city, tool="get_weather")
+    return _cached_call("get_weather", _weather_args(city), _fetch_weather)
+
+
+def _weather_args(city: str) -> dict:
+    """
+    Canonicalize a free-form city name into weather query arguments.
     
+    Exact names and aliases found in the city index are queried by
+    OpenWeather city ID, so spelling variants share one cache entry and one
+    upstream call. Anything else is queried by name.
+    """
+    match = _city_index.resolve(city) if _city_index else None
+    if match:
+        return {"city": match.name, "city_id": match.city_id}
+    return {"city": " ".join(city.split()), "city_id": None}
+
+
+def _fetch_weather(city: str, city_id: Optional[int] = None) -> dict:
+    """Fetch current weather from OpenWeather by city ID or name (uncached)."""
     if not OPENWEATHER_API_KEY:
         logger.warning("OpenWeather API key not found, using mock data")
         return {
@@ -69,15 +104,33 @@ def get_weather(city: str) -> dict:
             "success": True
         }
     
+    upstream_calls = 1
     try:
         url = "http://api.openweathermap.org/data/2.5/weather"
         params = {
-            "q": city,
             "appid": OPENWEATHER_API_KEY,
             "units": "metric"
         }
+        suggestion = _weather_suggestions.get(city) if city_id is None else None
+        if city_id is not None:
+            params["id"] = city_id
+        elif suggestion:
+            params["id"] = suggestion.city_id
+        else:
+            params["q"] = city
         
         response = requests.get(url, params=params, timeout=10)
+        
+        # Unknown name: retry with the index's closest guess, if any
+        if response.status_code == 404 and "q" in params and _city_index:
+            suggestion = _city_index.suggest(city)
+            if suggestion:
+                logger.info("OpenWeather does not know %r, retrying as %s", city, suggestion.name)
+                params.pop("q")
+                params["id"] = suggestion.city_id
+                response = requests.get(url, params=params, timeout=10)
+                upstream_calls = 2
+        
         response.raise_for_status()
         data = response.json()
         
@@ -93,16 +146,27 @@ def get_weather(city: str) -> dict:
             "mock": False,
             "success": True
         }
-        logger.info(f"Weather data retrieved successfully for {city}")
+        if suggestion:
+            result["resolved_from"] = city
+            if len(_weather_suggestions) >= _MAX_WEATHER_SUGGESTIONS:
+                _weather_suggestions.clear()
+            _weather_suggestions[city] = suggestion
+        if upstream_calls > 1:
+            # Lets the prefetch scheduler charge the retry against its budget
+            result["upstream_calls"] = upstream_calls
+        log_event(logger, "upstream_ok", "Weather data retrieved successfully for %s", city, tool="get_weather")
         return result
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching weather data: {str(e)}")
-        return {
+        result = {
             "success": False,
             "error": f"Failed to fetch weather: {str(e)}",
             "city": city
         }
+        if upstream_calls > 1:
+            result["upstream_calls"] = upstream_calls
+        return result
 
 
 # ============================================================================
@@ -122,11 +186,19 @@ def github_trends(language: str = "python", count: int = 5) -> dict:
         Dictionary containing list of trending repositories with stars,
         forks, description, and URLs
     """
-    logger.info(f"GitHub trends tool called: language={language}, count={count}")
+    log_event(
+        logger, "tool_request", "GitHub trends tool called: language=%s, count=%s", language, count,
+        tool="github_trends"
+    )
     
     # Validate count
     count = max(1, min(count, 20))
     
+    return _cached_call("github_trends", {"language": language, "count": count}, _fetch_github_trends)
+
+
+def _fetch_github_trends(language: str, count: int) -> dict:
+    """Fetch the most-starred repositories for a language from GitHub (uncached)."""
     if not GITHUB_TOKEN:
         logger.warning("GitHub token not found, using mock data")
         return {
@@ -162,27 +234,29 @@ def github_trends(language: str = "python", count: int = 5) -> dict:
             "per_page": count
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
+        # Stream the body and stop reading once `count` items are parsed
         repositories = []
-        for repo in data.get("items", [])[:count]:
-            repositories.append({
-                "name": repo["name"],
-                "full_name": repo["full_name"],
-                "description": repo["description"] or "No description provided",
-                "stars": repo["stargazers_count"],
-                "forks": repo["forks_count"],
-                "language": repo["language"],
-                "url": repo["html_url"],
-                "owner": repo["owner"]["login"],
-                "created_at": repo["created_at"],
-                "updated_at": repo["updated_at"],
-                "mock": False
-            })
+        with requests.get(url, headers=headers, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            for repo in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE), "items", limit=count):
+                repositories.append({
+                    "name": repo["name"],
+                    "full_name": repo["full_name"],
+                    "description": repo["description"] or "No description provided",
+                    "stars": repo["stargazers_count"],
+                    "forks": repo["forks_count"],
+                    "language": repo["language"],
+                    "url": repo["html_url"],
+                    "owner": repo["owner"]["login"],
+                    "created_at": repo["created_at"],
+                    "updated_at": repo["updated_at"],
+                    "mock": False
+                })
         
-        logger.info(f"Retrieved {len(repositories)} trending {language} repositories")
+        log_event(
+            logger, "upstream_ok", "Retrieved %d trending %s repositories", len(repositories), language,
+            tool="github_trends"
+        )
         return {
             "success": True,
             "language": language,
@@ -191,7 +265,7 @@ def github_trends(language: str = "python", count: int = 5) -> dict:
             "mock": False
         }
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         logger.error(f"Error fetching GitHub trends: {str(e)}")
         return {
             "success": False,
@@ -217,11 +291,19 @@ def get_news(count: int = 3, query: Optional[str] = None) -> dict:
         Dictionary containing list of news articles with title, description,
         source, and URLs
     """
-    logger.info(f"News tool called: count={count}, query={query}")
+    log_event(
+        logger, "tool_request", "News tool called: count=%s, query=%s", count, query,
+        tool="get_news"
+    )
     
     # Validate count
     count = max(1, min(count, 10))
     
+    return _cached_call("get_news", {"count": count, "query": query}, _fetch_news)
+
+
+def _fetch_news(count: int, query: Optional[str]) -> dict:
+    """Fetch top headlines or query results from NewsAPI (uncached)."""
     if not NEWS_API_KEY:
         logger.warning("NewsAPI key not found, using mock data")
         topics = ["AI", "Climate", "Technology", "Space", "Economy"]
@@ -256,23 +338,25 @@ def get_news(count: int = 3, query: Optional[str] = None) -> dict:
         else:
             params["country"] = "us"
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
+        # Stream the body and stop reading once `count` articles are parsed
         articles = []
-        for article in data.get("articles", [])[:count]:
-            articles.append({
-                "title": article["title"],
-                "description": article["description"] or "No description available",
-                "source": article["source"]["name"],
-                "author": article.get("author", "Unknown"),
-                "published_at": article["publishedAt"],
-                "url": article["url"],
-                "mock": False
-            })
+        with requests.get(url, headers=headers, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            for article in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE), "articles", limit=count):
+                articles.append({
+                    "title": article["title"],
+                    "description": article["description"] or "No description available",
+                    "source": article["source"]["name"],
+                    "author": article.get("author", "Unknown"),
+                    "published_at": article["publishedAt"],
+                    "url": article["url"],
+                    "mock": False
+                })
         
-        logger.info(f"Retrieved {len(articles)} news headlines")
+        log_event(
+            logger, "upstream_ok", "Retrieved %d news headlines", len(articles),
+            tool="get_news"
+        )
         return {
             "success": True,
             "count": len(articles),
@@ -281,7 +365,7 @@ def get_news(count: int = 3, query: Optional[str] = None) -> dict:
             "mock": False
         }
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         logger.error(f"Error fetching news headlines: {str(e)}")
         return {
             "success": False,
@@ -290,6 +374,133 @@ def get_news(count: int = 3, query: Optional[str] = None) -> dict:
         }
 
 
+# ============================================================================
+# Result Cache & Prefetching
+# ============================================================================
+
+# Cache TTLs in seconds per tool
+CACHE_TTLS = {
+    "get_weather": float(os.getenv("CACHE_TTL_WEATHER", "600")),
+    "github_trends": float(os.getenv("CACHE_TTL_GITHUB", "3600")),
+    "get_news": float(os.getenv("CACHE_TTL_NEWS", "900"))
+}
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_TOP_K = int(os.getenv("PREFETCH_TOP_K", "20"))
+PREFETCH_BUDGET_PER_HOUR = float(os.getenv("PREFETCH_BUDGET_PER_HOUR", "120"))
+PREFETCH_LEAD_SECONDS = float(os.getenv("PREFETCH_LEAD_SECONDS", "30"))
+PREFETCH_WARM_LIST = os.getenv("PREFETCH_WARM_LIST", "")
+
+# On-disk result store shared across processes and restarts
+RESULT_STORE_ENABLED = os.getenv("RESULT_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "")
+RESULT_STORE_MAX_MB = float(os.getenv("RESULT_STORE_MAX_MB", "64"))
+
+# Default arguments filled into warm list entries so they match tool call keys
+_PREFETCH_DEFAULT_ARGS = {
+    "github_trends": {"count": 5},
+    "get_news": {"count": 3, "query": None}
+}
+
+
+def _warm_args(tool_name: str, arguments: dict) -> dict:
+    """Expand a warm list entry into the arguments its tool call would cache under."""
+    if tool_name == "get_weather":
+        return _weather_args(arguments["city"])
+    return {**_PREFETCH_DEFAULT_ARGS.get(tool_name, {}), **arguments}
+
+_cache = TTLCache()
+_store = (
+    open_result_store(RESULT_STORE_PATH or None, int(RESULT_STORE_MAX_MB * 1024 * 1024))
+    if RESULT_STORE_ENABLED else None
+)
+
+
+def _store_get(tool_name: str, arguments: dict):
+    """Read from the on-disk store; store errors are logged and treated as misses."""
+    if _store is None:
+        return None
+    try:
+        return _store.get(tool_name, arguments)
+    except sqlite3.Error as e:
+        logger.error(f"Result store read failed: {str(e)}")
+        return None
+
+
+def _store_put(tool_name: str, arguments: dict, result: dict) -> None:
+    """Write to the on-disk store; store errors are logged and ignored."""
+    if _store is None:
+        return
+    try:
+        _store.put(tool_name, arguments, result, CACHE_TTLS[tool_name])
+    except sqlite3.Error as e:
+        logger.error(f"Result store write failed: {str(e)}")
+
+
+# Only tools backed by a real API are worth prefetching; mock data is free
+_prefetcher = PrefetchScheduler(
+    _cache,
+    loaders={
+        name: loader
+        for name, loader, configured in [
+            ("get_weather", _fetch_weather, OPENWEATHER_API_KEY),
+            ("github_trends", _fetch_github_trends, GITHUB_TOKEN),
+            ("get_news", _fetch_news, NEWS_API_KEY)
+        ]
+        if configured
+    },
+    ttls=CACHE_TTLS,
+    top_k=PREFETCH_TOP_K,
+    budget_per_hour=PREFETCH_BUDGET_PER_HOUR,
+    lead_time=PREFETCH_LEAD_SECONDS,
+    store_get=_store_get,
+    store_put=_store_put
+)
+_prefetcher.warm(
+    (tool_name, _warm_args(tool_name, arguments))
+    for tool_name, arguments in parse_warm_list(PREFETCH_WARM_LIST)
+)
+
+
+def _cached_call(tool_name: str, arguments: dict, loader) -> dict:
+    """
+    Serve a tool call from the result cache, fetching and caching on a miss.
+    
+    Lookups go to the in-process cache first, then the shared on-disk store,
+    then upstream. Only successful, non-mock results are cached. Every call
+    is also recorded with the prefetch scheduler so hot arguments are
+    refreshed ahead of expiry once the server has started it.
+    """
+    if PREFETCH_ENABLED and _prefetcher.loaders:
+        _prefetcher.record(tool_name, arguments)
+    
+    started = time.perf_counter()
+    key = make_key(tool_name, arguments)
+    cached = _cache.get(key)
+    stored = _store_get(tool_name, arguments) if cached is None else None
+    if cached is not None:
+        result, cache_status = cached, "hit"
+    elif stored is not None:
+        result, remaining = stored
+        cache_status = "store"
+        _cache.set(key, result, remaining)
+    else:
+        # Keep the scheduler from fetching the same key concurrently
+        with _prefetcher.loading(key):
+            result, cache_status = loader(**arguments), "miss"
+        result.pop("upstream_calls", None)
+        if result.get("success") and not result.get("mock"):
+            _cache.set(key, result, CACHE_TTLS[tool_name])
+            _store_put(tool_name, arguments, result)
+    
+    latency_ms = round((time.perf_counter() - started) * 1000, 3)
+    log_event(
+        logger, "tool_call", "Tool %s completed in %.3f ms (cache %s)", tool_name, latency_ms, cache_status,
+        tool=tool_name, latency_ms=latency_ms, cache=cache_status
+    )
+    return result
+
+
 # ============================================================================
 # Server Info
 # ============================================================================
@@ -311,6 +522,9 @@ def server_info() -> dict:
             "openweather": bool(OPENWEATHER_API_KEY),
             "news": bool(NEWS_API_KEY)
         },
+        "cache": _cache.stats(),
+        "prefetch": _prefetcher.stats(),
+        "result_store": _store.stats() if _store else {"enabled": False},
         "status": "running",
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -324,5 +538,11 @@ if __name__ == "__main__":
     logger.info("Starting MCP server with FastMCP...")
     logger.info(f"Configured API keys: GitHub={bool(GITHUB_TOKEN)}, OpenWeather={bool(OPENWEATHER_API_KEY)}, News={bool(NEWS_API_KEY)}")
     
+    # Warm the cache before serving. Only the server runs the scheduler, so
+    # short-lived adk_agent.py processes importing this module never spend
+    # prefetch budget of their own.
+    if PREFETCH_ENABLED and _prefetcher.loaders:
+        _prefetcher.start()
+    
     # Run the MCP server
     mcp.run()
@@ -0,0 +1,438 @@
+"""
+Tool Result Cache & Prefetch Scheduler
+======================================
+In-process TTL cache for MCP tool results plus a background scheduler that
+keeps the hot set warm:
+
+1. TTLCache - thread-safe result cache with per-entry expiry
+2. DecayingSketch - count-min sketch with exponential decay for argument popularity
+3. PrefetchScheduler - refreshes the top-K entries shortly before they expire,
+   within an upstream-call budget
+
+Used by mcp_server.py; see PREFETCH_* settings in .env.example.
+"""
+
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def make_key(tool_name: str, arguments: Dict[str, Any]) -> CacheKey:
+    """Build a hashable cache key from a tool name and its arguments."""
+    return tool_name, tuple(sorted(arguments.items()))
+
+
+# ============================================================================
+# TTL Cache
+# ============================================================================
+
+class TTLCache:
+    """Thread-safe result cache where every entry carries its own expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before the soonest-expiring
+                ones are dropped
+        """
+        self.max_entries = max_entries
+        self._entries: Dict[CacheKey, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: CacheKey, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            if len(self._entries) > self.max_entries:
+                self._evict_locked()
+
+    def expires_in(self, key: CacheKey) -> Optional[float]:
+        """Seconds until key expires (negative if stale), or None if absent."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[1] - time.monotonic()
+
+    def _evict_locked(self) -> None:
+        """Drop expired entries, then the soonest-expiring ones, down to capacity."""
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+        excess = len(self._entries) - self.max_entries
+        if excess > 0:
+            for key, _ in heapq.nsmallest(excess, self._entries.items(), key=lambda kv: kv[1][1]):
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+# ============================================================================
+# Decaying Frequency Sketch
+# ============================================================================
+
+class DecayingSketch:
+    """
+    Count-min sketch whose counts decay exponentially with a fixed half-life.
+
+    Decay is applied lazily: increments are scaled up by 2^(t / half_life)
+    and estimates scaled back down, so no periodic sweep over the table is
+    needed. The table is renormalized before the scale factor grows large.
+    """
+
+    _RENORMALIZE_AT = 2.0 ** 32
+
+    def __init__(self, width: int = 1024, depth: int = 4, half_life: float = 600.0):
+        """
+        Initialize the sketch.
+
+        Args:
+            width: Counters per row
+            depth: Number of hash rows
+            half_life: Seconds for an unrefreshed count to halve
+        """
+        self.width = width
+        self.depth = depth
+        self.half_life = half_life
+        self._rows = [[0.0] * width for _ in range(depth)]
+        self._epoch = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _scale(self, now: float) -> float:
+        return 2.0 ** ((now - self._epoch) / self.half_life)
+
+    def _slots(self, key: Any) -> List[int]:
+        return [hash((row, key)) % self.width for row in range(self.depth)]
+
+    def add(self, key: Any, amount: float = 1.0) -> float:
+        """Record amount occurrences of key and return its decayed estimate."""
+        now = time.monotonic()
+        slots = self._slots(key)
+        with self._lock:
+            scale = self._scale(now)
+            if scale >= self._RENORMALIZE_AT:
+                self._renormalize(now, scale)
+                scale = 1.0
+            weighted = amount * scale
+            estimate = math.inf
+            for row, slot in zip(self._rows, slots):
+                row[slot] += weighted
+                estimate = min(estimate, row[slot])
+            return estimate / scale
+
+    def estimate(self, key: Any) -> float:
+        """Return the decayed occurrence estimate for key."""
+        slots = self._slots(key)
+        with self._lock:
+            scale = self._scale(time.monotonic())
+            return min(row[slot] for row, slot in zip(self._rows, slots)) / scale
+
+    def _renormalize(self, now: float, scale: float) -> None:
+        for row in self._rows:
+            for i in range(self.width):
+                row[i] /= scale
+        self._epoch = now
+
+
+# ============================================================================
+# Prefetch Scheduler
+# ============================================================================
+
+class PrefetchScheduler:
+    """
+    Background thread that refreshes popular cache entries before they expire.
+
+    Callers report every tool call via record(). The scheduler keeps a bounded
+    candidate set of the most popular keys (ranked by the decaying sketch) and,
+    every tick, re-fetches the top-K whose cache entry is missing or due to
+    expire within lead_time. Upstream calls, including the initial warm list
+    load, are limited to budget_per_hour over a sliding one-hour window.
+    A loader that needed more than one upstream call says so with an
+    "upstream_calls" entry in its result, and the extra calls are charged
+    too. Keys whose load fails are retried with exponential backoff, and keys
+    being loaded by a foreground call (see loading()) are skipped. With a
+    shared store, results another process already refreshed are copied into
+    the cache instead of being fetched again.
+
+    The budget is per scheduler; only the long-running server starts one.
+    """
+
+    def __init__(
+        self,
+        cache: TTLCache,
+        loaders: Dict[str, Callable[..., Dict[str, Any]]],
+        ttls: Dict[str, float],
+        top_k: int = 20,
+        budget_per_hour: float = 120.0,
+        lead_time: float = 30.0,
+        interval: float = 5.0,
+        min_score: float = 2.0,
+        half_life: float = 600.0,
+        store_get: Optional[Callable[[str, Dict[str, Any]], Optional[Tuple[Dict[str, Any], float]]]] = None,
+        store_put: Optional[Callable[[str, Dict[str, Any], Dict[str, Any]], None]] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            cache: Cache to keep warm
+            loaders: Tool name -> function that fetches a fresh result
+            ttls: Tool name -> cache TTL in seconds
+            top_k: Number of hottest keys to keep refreshed
+            budget_per_hour: Maximum upstream calls per hour spent on prefetching
+            lead_time: Refresh entries expiring within this many seconds
+            interval: Seconds between scheduling passes
+            min_score: Minimum decayed popularity for a key to be refreshed
+            half_life: Popularity half-life in seconds
+            store_get: Optional shared-store lookup, (tool_name, arguments) ->
+                (result, seconds until expiry) or None, checked before fetching
+            store_put: Optional shared-store writer, (tool_name, arguments,
+                result), that refreshed results are also written to
+        """
+        self.cache = cache
+        self.loaders = loaders
+        self.ttls = ttls
+        self.top_k = top_k
+        self.budget_per_hour = budget_per_hour
+        self.lead_time = lead_time
+        self.interval = interval
+        self.min_score = min_score
+        self.store_get = store_get
+        self.store_put = store_put
+
+        self.sketch = DecayingSketch(half_life=half_life)
+        self._candidates: Dict[CacheKey, Dict[str, Any]] = {}
+        self._pinned: Dict[CacheKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        # Timestamps of upstream calls made in the last hour
+        self._spent: deque = deque()
+        # Keys currently being fetched, by the foreground or by this thread
+        self._loading: set = set()
+        # Key -> (consecutive failures, monotonic time of next retry)
+        self._backoff: Dict[CacheKey, Tuple[int, float]] = {}
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.from_store = 0
+        self.skipped_for_budget = 0
+
+    def record(self, tool_name: str, arguments: Dict[str, Any]) -> None:
+        """Record a client call so its arguments count toward popularity."""
+        if tool_name not in self.loaders:
+            return
+        key = make_key(tool_name, arguments)
+        self.sketch.add(key)
+        with self._lock:
+            if key in self._candidates:
+                return
+            self._candidates[key] = dict(arguments)
+            # Keep the candidate set bounded; drop the coldest key
+            if len(self._candidates) > self.top_k * 4:
+                coldest = min(self._candidates, key=self.sketch.estimate)
+                del self._candidates[coldest]
+                if coldest not in self._pinned:
+                    self._backoff.pop(coldest, None)
+
+    def warm(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Pin a static list of (tool_name, arguments) to always keep cached."""
+        with self._lock:
+            for tool_name, arguments in entries:
+                if tool_name not in self.loaders:
+                    logger.warning("Ignoring warm entry for unknown tool: %s", tool_name)
+                    continue
+                self._pinned[make_key(tool_name, arguments)] = dict(arguments)
+
+    def start(self) -> None:
+        """Start the background thread (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetch-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Prefetch scheduler started: top_k=%d, budget=%.0f calls/hour, pinned=%d",
+            self.top_k, self.budget_per_hour, len(self._pinned)
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal the background thread to exit and wait for it."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Prefetch pass failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    @contextmanager
+    def loading(self, key: CacheKey):
+        """Mark key as being fetched so the scheduler does not fetch it too."""
+        with self._lock:
+            self._loading.add(key)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._loading.discard(key)
+
+    def _spend_budget(self) -> bool:
+        """Reserve one upstream call if the last hour's budget allows it."""
+        now = time.monotonic()
+        while self._spent and self._spent[0] <= now - 3600.0:
+            self._spent.popleft()
+        if len(self._spent) >= self.budget_per_hour:
+            return False
+        self._spent.append(now)
+        return True
+
+    def _record_failure(self, key: CacheKey) -> None:
+        """Back off exponentially, up to the tool's TTL, before retrying key."""
+        with self._lock:
+            failures = self._backoff.get(key, (0, 0.0))[0] + 1
+            delay = min(self.interval * 2 ** failures, self.ttls[key[0]])
+            self._backoff[key] = (failures, time.monotonic() + delay)
+
+    def due(self) -> List[Tuple[CacheKey, Dict[str, Any]]]:
+        """Return the keys to refresh this pass, most urgent first."""
+        now = time.monotonic()
+        with self._lock:
+            # Forget failures of keys that are no longer tracked
+            for key in [k for k in self._backoff if k not in self._candidates and k not in self._pinned]:
+                del self._backoff[key]
+            skip = set(self._loading)
+            skip.update(k for k, (_, retry_at) in self._backoff.items() if retry_at > now)
+            pinned = [(k, a) for k, a in self._pinned.items() if k not in skip]
+            candidates = [
+                (k, a) for k, a in self._candidates.items() if k not in self._pinned and k not in skip
+            ]
+
+        scored = [(self.sketch.estimate(k), k, a) for k, a in candidates]
+        hot = heapq.nlargest(self.top_k, scored, key=lambda item: item[0])
+        selected = pinned + [(k, a) for score, k, a in hot if score >= self.min_score]
+
+        due = []
+        for key, arguments in selected:
+            remaining = self.cache.expires_in(key)
+            if remaining is None or remaining <= self.lead_time:
+                due.append((remaining if remaining is not None else -math.inf, key, arguments))
+        due.sort(key=lambda item: item[0])
+        return [(key, arguments) for _, key, arguments in due]
+
+    def run_once(self) -> int:
+        """Run a single scheduling pass and return the number of refreshes."""
+        refreshed = 0
+        for key, arguments in self.due():
+            tool_name = key[0]
+            # Another process may have refreshed this key already
+            stored = self.store_get(tool_name, arguments) if self.store_get else None
+            if stored is not None:
+                result, remaining = stored
+                self.cache.set(key, result, remaining)
+                if remaining > self.lead_time:
+                    self.from_store += 1
+                    continue
+            if not self._spend_budget():
+                self.skipped_for_budget += 1
+                break
+            with self.loading(key):
+                try:
+                    result = self.loaders[tool_name](**arguments)
+                except Exception as e:
+                    logger.error(f"Prefetch of {tool_name} failed: {str(e)}")
+                    result = {"success": False}
+            for _ in range(result.pop("upstream_calls", 1) - 1):
+                self._spent.append(time.monotonic())
+            if result.get("success") and not result.get("mock"):
+                self.cache.set(key, result, self.ttls[tool_name])
+                with self._lock:
+                    self._backoff.pop(key, None)
+                if self.store_put:
+                    self.store_put(tool_name, arguments, result)
+            else:
+                self._record_failure(key)
+            refreshed += 1
+        self.refreshes += refreshed
+        if refreshed:
+            logger.info("Prefetch pass refreshed %d entries", refreshed)
+        return refreshed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return scheduler counters for server_info."""
+        now = time.monotonic()
+        with self._lock:
+            tracked = len(self._candidates)
+            pinned = len(self._pinned)
+            backing_off = sum(1 for _, retry_at in self._backoff.values() if retry_at > now)
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "tracked_keys": tracked,
+            "pinned_keys": pinned,
+            "refreshes": self.refreshes,
+            "from_store": self.from_store,
+            "skipped_for_budget": self.skipped_for_budget,
+            "backing_off": backing_off,
+            "budget_per_hour": self.budget_per_hour,
+            "spent_last_hour": len(self._spent)
+        }
+
+
+def parse_warm_list(spec: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse a warm list like "get_weather:Delhi,github_trends:python".
+
+    The value after the colon is the tool's primary argument (city for
+    get_weather, language for github_trends, query for get_news).
+    """
+    primary_args = {"get_weather": "city", "github_trends": "language", "get_news": "query"}
+    entries = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        tool_name, _, value = item.partition(":")
+        tool_name = tool_name.strip()
+        arg_name = primary_args.get(tool_name)
+        if arg_name is None or not value.strip():
+            logger.warning("Ignoring malformed warm list entry: %s", item)
+            continue
+        entries.append((tool_name, {arg_name: value.strip()}))
+    return entries
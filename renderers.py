@@ -0,0 +1,302 @@
+"""
+Report Renderers
+================
+Output backends for ADKAgent. Each section (weather, GitHub trends, news,
+AI insight, error) is written to the stream as soon as it is produced
+instead of being concatenated into one large string:
+
+1. TextRenderer - the human-readable emoji report
+2. JsonRenderer - one JSON document: {"format": ..., "sections": [...]}
+3. JsonLinesRenderer - one JSON object per section, one per line
+
+Selected in adk_agent.py with --output text|json|jsonl.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TextIO
+
+REPORT_FORMAT = "adk-agent-report/1"
+
+
+class ReportRenderer(ABC):
+    """Base class for streaming report renderers."""
+
+    def __init__(self, stream: TextIO):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream: Text stream sections are written to
+        """
+        self.stream = stream
+
+    @abstractmethod
+    def begin_report(self, title: str, generated_at: datetime) -> None:
+        """Start a multi-section report."""
+
+    @abstractmethod
+    def end_report(self) -> None:
+        """Finish a multi-section report."""
+
+    @abstractmethod
+    def weather(self, data: Dict[str, Any]) -> None:
+        """Render a get_weather result."""
+
+    @abstractmethod
+    def github(self, data: Dict[str, Any]) -> None:
+        """Render a github_trends result."""
+
+    @abstractmethod
+    def news(self, data: Dict[str, Any]) -> None:
+        """Render a get_news result."""
+
+    @abstractmethod
+    def insight(self, label: str, text: str) -> None:
+        """Render an AI-generated insight or summary."""
+
+    @abstractmethod
+    def error(self, source: str, message: str) -> None:
+        """Render an error raised while producing a section."""
+
+    @abstractmethod
+    def server_info(self, data: Dict[str, Any]) -> None:
+        """Render a server_info result."""
+
+    def close(self) -> None:
+        """Flush any trailing output."""
+        self.stream.flush()
+
+
+# ============================================================================
+# Text Renderer
+# ============================================================================
+
+class TextRenderer(ReportRenderer):
+    """
+    Human-readable report.
+
+    Each section is formatted in full before anything is written, so a
+    malformed result raises without leaving half a section on the stream.
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self._in_report = False
+        self._sections = 0
+        self._wrote_section = False
+
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+
+    def _write_section(self, text: str) -> None:
+        """Write one fully formatted section, preceded by a divider within a report."""
+        if self._in_report and self._sections:
+            self._write(f"\n{'-'*80}\n")
+        self._sections += 1
+        self._write(text)
+        self._wrote_section = True
+        self.stream.flush()
+
+    def begin_report(self, title: str, generated_at: datetime) -> None:
+        self._in_report = True
+        self._sections = 0
+        self._write(f"\n{'='*80}\n")
+        self._write(f"📊 {title} - {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._write(f"{'='*80}\n")
+
+    def end_report(self) -> None:
+        self._write(f"\n{'='*80}\n")
+        self._in_report = False
+        self.stream.flush()
+
+    def _failure(self, data: Dict[str, Any]) -> Optional[str]:
+        """Return the error line for an unsuccessful tool result."""
+        if data.get("success"):
+            return None
+        return f"❌ Error: {data.get('error', 'Unknown error')}"
+
+    def weather(self, data: Dict[str, Any]) -> None:
+        failure = self._failure(data)
+        if failure:
+            self._write_section(failure)
+            return
+
+        mock_note = " [Using mock data]" if data.get("mock") else ""
+        country = f", {data.get('country', '')}" if data.get('country') else ""
+
+        self._write_section(
+            f"\n🌤️  Weather in {data['city']}{country}{mock_note}:\n"
+            f"   Temperature: {data['temperature']}°C (feels like {data['feels_like']}°C)\n"
+            f"   Conditions: {data['description'].title()}\n"
+            f"   Humidity: {data['humidity']}%\n"
+            f"   Wind Speed: {data['wind_speed']} m/s\n"
+        )
+
+    def github(self, data: Dict[str, Any]) -> None:
+        failure = self._failure(data)
+        if failure:
+            self._write_section(failure)
+            return
+
+        repos = data.get("repositories", [])
+        if not repos:
+            self._write_section("No repositories found.")
+            return
+
+        mock_note = " [Using mock data]" if data.get("mock") else ""
+        language = data.get("language", "Unknown")
+
+        lines: List[str] = [f"\n⭐ Top {len(repos)} Trending {language.title()} Repositories{mock_note}:\n\n"]
+        for i, repo in enumerate(repos, 1):
+            lines.append(f"{i}. {repo['full_name']}\n")
+            lines.append(f"   ⭐ {repo['stars']:,} stars | 🍴 {repo['forks']:,} forks\n")
+            lines.append(f"   📝 {repo['description']}\n")
+            lines.append(f"   🔗 {repo['url']}\n\n")
+        self._write_section("".join(lines))
+
+    def news(self, data: Dict[str, Any]) -> None:
+        failure = self._failure(data)
+        if failure:
+            self._write_section(failure)
+            return
+
+        articles = data.get("articles", [])
+        if not articles:
+            self._write_section("No news headlines found.")
+            return
+
+        mock_note = " [Using mock data]" if data.get("mock") else ""
+
+        lines: List[str] = [f"\n📰 Top {len(articles)} News Headlines{mock_note}:\n\n"]
+        for i, article in enumerate(articles, 1):
+            lines.append(f"{i}. {article['title']}\n")
+            lines.append(f"   Source: {article['source']}\n")
+            lines.append(f"   {article['description']}\n")
+            lines.append(f"   🔗 {article['url']}\n\n")
+        self._write_section("".join(lines))
+
+    def insight(self, label: str, text: str) -> None:
+        if self._in_report:
+            self._write_section(f"\n🤖 {label}:\n{text}\n")
+        else:
+            self._write_section(f"\n💡 {label}: {text}\n")
+
+    def error(self, source: str, message: str) -> None:
+        if self._in_report:
+            self._write_section(f"\n❌ {source} Error: {message}\n")
+        else:
+            self._write_section(f"❌ Error: {message}")
+
+    def server_info(self, data: Dict[str, Any]) -> None:
+        lines: List[str] = [
+            "📋 MCP Server Information:\n",
+            f"   Name: {data.get('name')}\n",
+            f"   Version: {data.get('version')}\n",
+            f"   Tools: {', '.join(data.get('tools', []))}\n",
+            f"   Status: {data.get('status')}\n",
+            "\n🔑 API Keys Configured:\n"
+        ]
+        for key, value in data.get('api_keys_configured', {}).items():
+            status = "✅" if value else "❌"
+            lines.append(f"   {status} {key}\n")
+        self._write("".join(lines))
+        self.stream.flush()
+
+    def close(self) -> None:
+        # Trailing newline after task output, matching the print(result) the
+        # CLI used previously; server info was printed line by line without it
+        if self._wrote_section:
+            self._write("\n")
+        super().close()
+
+
+# ============================================================================
+# JSON Renderers
+# ============================================================================
+
+class _EventRenderer(ReportRenderer):
+    """Renderer that turns every section into a JSON-serializable event."""
+
+    @abstractmethod
+    def _emit(self, event: Dict[str, Any]) -> None:
+        """Write one event to the stream."""
+
+    def _dumps(self, event: Dict[str, Any]) -> str:
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+    def begin_report(self, title: str, generated_at: datetime) -> None:
+        self._emit({"type": "report_start", "title": title, "generated_at": generated_at.isoformat()})
+
+    def end_report(self) -> None:
+        self._emit({"type": "report_end"})
+
+    def weather(self, data: Dict[str, Any]) -> None:
+        self._emit({"type": "weather", "data": data})
+
+    def github(self, data: Dict[str, Any]) -> None:
+        self._emit({"type": "github_trends", "data": data})
+
+    def news(self, data: Dict[str, Any]) -> None:
+        self._emit({"type": "news", "data": data})
+
+    def insight(self, label: str, text: str) -> None:
+        self._emit({"type": "insight", "label": label, "text": text})
+
+    def error(self, source: str, message: str) -> None:
+        self._emit({"type": "error", "source": source, "message": message})
+
+    def server_info(self, data: Dict[str, Any]) -> None:
+        self._emit({"type": "server_info", "data": data})
+
+
+class JsonLinesRenderer(_EventRenderer):
+    """One JSON object per section, newline-delimited and flushed immediately."""
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        self.stream.write(self._dumps(event) + "\n")
+        self.stream.flush()
+
+
+class JsonRenderer(_EventRenderer):
+    """
+    A single JSON document, streamed section by section.
+
+    The document is {"format": REPORT_FORMAT, "sections": [event, ...]}; the
+    closing brackets are written by close().
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self._count = 0
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        if self._count == 0:
+            self.stream.write(f'{{"format": "{REPORT_FORMAT}", "sections": [\n')
+        else:
+            self.stream.write(",\n")
+        self.stream.write(self._dumps(event))
+        self._count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self._count == 0:
+            self.stream.write(f'{{"format": "{REPORT_FORMAT}", "sections": [')
+        self.stream.write("\n]}\n")
+        super().close()
+
+
+RENDERERS = {
+    "text": TextRenderer,
+    "json": JsonRenderer,
+    "jsonl": JsonLinesRenderer
+}
+
+
+def make_renderer(output: str, stream: TextIO) -> ReportRenderer:
+    """Create the renderer registered under `output` ("text", "json" or "jsonl")."""
+    try:
+        return RENDERERS[output](stream)
+    except KeyError:
+        raise ValueError(f"Unknown output format: {output}") from None
@@ -0,0 +1,223 @@
+"""
+Persistent Tool Result Store
+============================
+SQLite-backed result store shared by every process on the machine and
+surviving restarts - separate adk_agent.py CLI runs and the MCP server all
+read and write the same file.
+
+- WAL journal mode, so readers never block the writer and concurrent
+  processes see each other's results immediately
+- Keys are the tool name plus its normalized arguments; every entry carries
+  the TTL of the tool that produced it
+- Values are marshal-encoded and zlib-compressed when large
+- Total stored bytes are bounded; expired entries go first, then the
+  entries closest to expiry. The running total lives in a meta row kept
+  up to date by triggers, so writes never scan the table
+"""
+
+import json
+import logging
+import marshal
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "tool_results.sqlite3")
+
+# Encoding header: format tag plus the marshal version that wrote the entry
+_RAW = 0x01
+_ZLIB = 0x02
+_COMPRESS_ABOVE = 1024
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS results (
+    key        TEXT PRIMARY KEY,
+    tool       TEXT NOT NULL,
+    value      BLOB NOT NULL,
+    size       INTEGER NOT NULL,
+    stored_at  REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value)
+    SELECT 'stored_bytes', COALESCE(SUM(size), 0) FROM results;
+CREATE TRIGGER IF NOT EXISTS results_size_insert AFTER INSERT ON results BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'stored_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS results_size_update AFTER UPDATE OF size ON results BEGIN
+    UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'stored_bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS results_size_delete AFTER DELETE ON results BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'stored_bytes';
+END;
+COMMIT;
+"""
+
+
+def encode_result(value: Dict[str, Any]) -> bytes:
+    """Encode a result dict into the store's compact binary form."""
+    payload = marshal.dumps(value)
+    if len(payload) > _COMPRESS_ABOVE:
+        return bytes((_ZLIB, marshal.version)) + zlib.compress(payload, 6)
+    return bytes((_RAW, marshal.version)) + payload
+
+
+def decode_result(blob: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a stored result, or return None if it was written incompatibly."""
+    if len(blob) < 2 or blob[1] != marshal.version:
+        return None
+    try:
+        if blob[0] == _ZLIB:
+            return marshal.loads(zlib.decompress(blob[2:]))
+        if blob[0] == _RAW:
+            return marshal.loads(blob[2:])
+    except (ValueError, EOFError, TypeError, zlib.error):
+        pass
+    return None
+
+
+def make_store_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Build a stable text key from a tool name and its normalized arguments."""
+    return json.dumps([tool_name, sorted(arguments.items())], separators=(",", ":"), default=str)
+
+
+class ResultStore:
+    """Process-safe, size-bounded, TTL-aware result store on SQLite."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on the total encoded size of stored results
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Look up a fresh result.
+
+        Returns:
+            (result, seconds until expiry), or None on a miss
+        """
+        now = time.time()
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?",
+            (make_store_key(tool_name, arguments), now)
+        ).fetchone()
+        value = decode_result(row[0]) if row else None
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            return None
+        return value, row[1] - now
+
+    def put(self, tool_name: str, arguments: Dict[str, Any], value: Dict[str, Any], ttl: float) -> None:
+        """Store a result for ttl seconds, evicting old entries if over budget."""
+        blob = encode_result(value)
+        now = time.time()
+        conn = self._connect()
+        # An upsert (not INSERT OR REPLACE) so the size triggers see the update
+        conn.execute(
+            "INSERT INTO results (key, tool, value, size, stored_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET tool = excluded.tool, value = excluded.value, "
+            "size = excluded.size, stored_at = excluded.stored_at, expires_at = excluded.expires_at",
+            (make_store_key(tool_name, arguments), tool_name, blob, len(blob), now, now + ttl)
+        )
+        if self._stored_bytes(conn) > self.max_bytes:
+            self._evict(conn, now)
+
+    def _stored_bytes(self, conn: sqlite3.Connection) -> int:
+        """Return the trigger-maintained total size of all stored results."""
+        return conn.execute("SELECT value FROM meta WHERE name = 'stored_bytes'").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired entries, then the soonest-expiring, down to 90% of max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+            total = self._stored_bytes(conn)
+            if total > target:
+                doomed, freed = [], 0
+                for key, size in conn.execute("SELECT key, size FROM results ORDER BY expires_at"):
+                    if total - freed <= target:
+                        break
+                    doomed.append((key,))
+                    freed += size
+                conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+                removed += len(doomed)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        with self._stats_lock:
+            self.evictions += removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio (this process) and store size (all processes)."""
+        conn = self._connect()
+        entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        stored = self._stored_bytes(conn)
+        with self._stats_lock:
+            total = self.hits + self.misses
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        return {
+            "path": self.path,
+            "entries": entries,
+            "stored_bytes": stored,
+            "file_bytes": sum(
+                os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p)
+            ),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "evictions": evictions
+        }
+
+
+def open_result_store(path: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024) -> Optional[ResultStore]:
+    """Open the result store, or return None (with a warning) if unavailable."""
+    path = path or DEFAULT_STORE_PATH
+    try:
+        return ResultStore(path, max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Result store unavailable at {path}: {str(e)}")
+        return None
@@ -0,0 +1,84 @@
+"""
+Chunk-boundary fuzz test for json_stream.iter_json_array.
+
+Every document is split into random chunks (including 1-byte chunks and
+splits inside multi-byte UTF-8 characters and numbers) and the streamed
+elements must equal what json.loads produces for the whole body.
+
+Run with: python -m pytest -q test_json_stream.py
+"""
+
+import json
+import random
+import unittest
+
+from json_stream import iter_json_array
+
+
+def random_number(rng: random.Random):
+    """A number in one of the forms most likely to be split mid-token."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return round(rng.uniform(-1000, 1000), rng.randint(1, 6))
+    if kind == 2:
+        return rng.uniform(-1, 1) * 10 ** rng.randint(-30, 30)
+    return rng.choice([0, -0.0, 1.5, 1e-7, 2.5e+21, 10**20])
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    """A random JSON value, nested at most three levels deep."""
+    kind = rng.randrange(8 if depth < 3 else 5)
+    if kind in (0, 1, 2):
+        return random_number(rng)
+    if kind == 3:
+        return "".join(rng.choice("ab\"\\/ é€😀\n") for _ in range(rng.randint(0, 8)))
+    if kind == 4:
+        return rng.choice([True, False, None])
+    if kind == 5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def random_chunks(rng: random.Random, body: bytes):
+    """Split body at random offsets."""
+    chunks, i = [], 0
+    while i < len(body):
+        size = rng.choice([1, 1, 2, 3, rng.randint(1, 64)])
+        chunks.append(body[i:i + size])
+        i += size
+    return chunks
+
+
+class ChunkBoundaryTest(unittest.TestCase):
+
+    def test_split_numbers(self):
+        for body, expected in ((b'{"items": [1.5, 2]}', [1.5, 2]),
+                               (b'{"items": [1e5, -2E-3]}', [1e5, -2e-3]),
+                               (b'{"items": [12345]}', [12345])):
+            for cut in range(1, len(body)):
+                with self.subTest(body=body, cut=cut):
+                    self.assertEqual(list(iter_json_array([body[:cut], body[cut:]], "items")), expected)
+
+    def test_random_chunkings(self):
+        rng = random.Random(1234)
+        for _ in range(500):
+            items = [random_value(rng) for _ in range(rng.randint(0, 8))]
+            doc = {"total": random_number(rng), "items": items, "after": random_value(rng)}
+            body = json.dumps(doc, ensure_ascii=rng.random() < 0.5,
+                              indent=rng.choice([None, 2])).encode("utf-8")
+            expected = json.loads(body)["items"]
+            limit = rng.choice([None, 1, 3])
+            if limit is not None:
+                expected = expected[:limit]
+            with self.subTest(body=body):
+                self.assertEqual(list(iter_json_array(random_chunks(rng, body), "items", limit=limit)), expected)
+
+    def test_invalid_body_raises(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array([b'{"items": [1.', b']}'], "items"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+Tests for prefetch.PrefetchScheduler: budget, backoff, due() ordering and
+the shared-store shortcut, driven by fake loaders.
+
+Run with: python -m pytest -q test_prefetch.py
+"""
+
+import time
+import unittest
+
+from prefetch import DecayingSketch, PrefetchScheduler, TTLCache, make_key
+
+
+class FakeLoader:
+    """Records every call; fails for cities listed in `failing`."""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    def __call__(self, city):
+        self.calls.append(city)
+        if city in self.failing:
+            return {"success": False, "error": "city not found"}
+        return {"success": True, "city": city}
+
+
+def make_scheduler(loader, **options):
+    options = {"interval": 0.01, "min_score": 0.0, **options}
+    return PrefetchScheduler(TTLCache(), {"get_weather": loader}, {"get_weather": 600.0}, **options)
+
+
+def weather_key(city):
+    return make_key("get_weather", {"city": city})
+
+
+class BudgetTest(unittest.TestCase):
+
+    def test_warm_list_is_charged_against_budget(self):
+        loader = FakeLoader()
+        scheduler = make_scheduler(loader, budget_per_hour=3)
+        scheduler.warm(("get_weather", {"city": f"city-{i}"}) for i in range(5))
+
+        self.assertEqual(scheduler.run_once(), 3)
+        self.assertEqual(len(loader.calls), 3)
+        self.assertEqual(scheduler.stats()["spent_last_hour"], 3)
+        self.assertEqual(scheduler.skipped_for_budget, 1)
+
+    def test_budget_holds_across_passes(self):
+        loader = FakeLoader()
+        scheduler = make_scheduler(loader, budget_per_hour=2)
+        scheduler.warm(("get_weather", {"city": f"city-{i}"}) for i in range(3))
+
+        scheduler.run_once()
+        scheduler.run_once()
+        self.assertEqual(len(loader.calls), 2)
+
+        # Once the calls age out of the one-hour window the budget is free again
+        scheduler._spent = type(scheduler._spent)(t - 3600.0 for t in scheduler._spent)
+        scheduler.run_once()
+        self.assertEqual(len(loader.calls), 3)
+
+    def test_extra_upstream_calls_are_charged(self):
+        calls = []
+
+        def retrying_loader(city):
+            calls.append(city)
+            return {"success": True, "city": city, "upstream_calls": 2}
+
+        scheduler = make_scheduler(retrying_loader, budget_per_hour=3)
+        scheduler.warm(("get_weather", {"city": f"city-{i}"}) for i in range(3))
+
+        scheduler.run_once()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(scheduler.stats()["spent_last_hour"], 4)
+        self.assertNotIn("upstream_calls", scheduler.cache.get(weather_key("city-0")))
+
+class BackoffTest(unittest.TestCase):
+
+    def test_failed_key_waits_before_retry(self):
+        loader = FakeLoader(failing={"Nowhere"})
+        scheduler = make_scheduler(loader)
+        scheduler.warm([("get_weather", {"city": "Nowhere"})])
+
+        scheduler.run_once()
+        scheduler.run_once()
+        self.assertEqual(loader.calls, ["Nowhere"])
+        self.assertEqual(scheduler.stats()["backing_off"], 1)
+
+        time.sleep(0.05)
+        self.assertEqual(scheduler.stats()["backing_off"], 0)
+        scheduler.run_once()
+        self.assertEqual(loader.calls, ["Nowhere", "Nowhere"])
+        self.assertEqual(scheduler._backoff[weather_key("Nowhere")][0], 2)
+
+    def test_success_clears_backoff(self):
+        loader = FakeLoader(failing={"Flaky"})
+        scheduler = make_scheduler(loader)
+        scheduler.warm([("get_weather", {"city": "Flaky"})])
+        scheduler.run_once()
+
+        loader.failing.clear()
+        time.sleep(0.05)
+        scheduler.run_once()
+        self.assertEqual(scheduler._backoff, {})
+        self.assertIsNotNone(scheduler.cache.get(weather_key("Flaky")))
+
+    def test_failed_keys_are_pruned_when_no_longer_tracked(self):
+        cities = [f"missing-{i}" for i in range(200)]
+        loader = FakeLoader(failing=cities)
+        scheduler = make_scheduler(loader, top_k=5)
+        for city in cities:
+            scheduler.record("get_weather", {"city": city})
+            scheduler.run_once()
+
+        self.assertEqual(len(scheduler._candidates), 20)
+        self.assertLessEqual(len(scheduler._backoff), len(scheduler._candidates))
+        self.assertTrue(set(scheduler._backoff) <= set(scheduler._candidates))
+
+
+class DueTest(unittest.TestCase):
+
+    def test_most_urgent_first_and_fresh_entries_skipped(self):
+        scheduler = make_scheduler(FakeLoader(), lead_time=30.0)
+        scheduler.warm(("get_weather", {"city": city}) for city in ("Fresh", "Soon", "Sooner", "Missing"))
+        scheduler.cache.set(weather_key("Fresh"), {"success": True}, 1000.0)
+        scheduler.cache.set(weather_key("Soon"), {"success": True}, 20.0)
+        scheduler.cache.set(weather_key("Sooner"), {"success": True}, 5.0)
+
+        order = [arguments["city"] for _, arguments in scheduler.due()]
+        self.assertEqual(order, ["Missing", "Sooner", "Soon"])
+
+    def test_keys_being_loaded_are_skipped(self):
+        loader = FakeLoader()
+        scheduler = make_scheduler(loader)
+        scheduler.warm([("get_weather", {"city": "Busy"}), ("get_weather", {"city": "Idle"})])
+
+        with scheduler.loading(weather_key("Busy")):
+            self.assertEqual([a["city"] for _, a in scheduler.due()], ["Idle"])
+            scheduler.run_once()
+        self.assertEqual(loader.calls, ["Idle"])
+
+    def test_only_hot_candidates_are_due(self):
+        scheduler = make_scheduler(FakeLoader(), top_k=2, min_score=2.0)
+        for city, calls in (("Hot", 5), ("Warm", 3), ("Cold", 1)):
+            for _ in range(calls):
+                scheduler.record("get_weather", {"city": city})
+
+        self.assertEqual(sorted(a["city"] for _, a in scheduler.due()), ["Hot", "Warm"])
+
+
+class SharedStoreTest(unittest.TestCase):
+
+    def test_fresh_store_entry_is_copied_instead_of_fetched(self):
+        loader = FakeLoader()
+        written = []
+        stored = {"Shared": ({"success": True, "city": "Shared", "from": "store"}, 300.0)}
+        scheduler = make_scheduler(
+            loader,
+            store_get=lambda tool_name, arguments: stored.get(arguments["city"]),
+            store_put=lambda tool_name, arguments, result: written.append(arguments["city"])
+        )
+        scheduler.warm([("get_weather", {"city": "Shared"}), ("get_weather", {"city": "Local"})])
+
+        scheduler.run_once()
+        self.assertEqual(loader.calls, ["Local"])
+        self.assertEqual(written, ["Local"])
+        self.assertEqual(scheduler.cache.get(weather_key("Shared"))["from"], "store")
+        self.assertLessEqual(scheduler.cache.expires_in(weather_key("Shared")), 300.0)
+        self.assertEqual(scheduler.stats()["from_store"], 1)
+        self.assertEqual(scheduler.stats()["spent_last_hour"], 1)
+
+
+class DecayingSketchTest(unittest.TestCase):
+
+    def test_counts_decay_with_half_life(self):
+        sketch = DecayingSketch(half_life=0.05)
+        for _ in range(8):
+            sketch.add("key")
+        self.assertAlmostEqual(sketch.estimate("key"), 8.0, delta=0.5)
+        time.sleep(0.1)
+        self.assertLess(sketch.estimate("key"), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Tests for result_store.ResultStore: the trigger-maintained size total,
+eviction order, entry encoding and upgrading stores from before the meta
+table existed.
+
+Run with: python -m pytest -q test_result_store.py
+"""
+
+import marshal
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from result_store import ResultStore, decode_result, encode_result, make_store_key
+
+
+def write_many(path: str, worker: int) -> None:
+    """Child process body for the concurrent-writer test."""
+    store = ResultStore(path, max_bytes=40_000)
+    for i in range(150):
+        store.put("get_news", {"query": f"q{(i + worker) % 60}"}, {"text": "x" * (i * 13 % 900)}, 60)
+
+
+class StoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "results.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def assertTotalMatches(self, store: ResultStore):
+        conn = store._connect()
+        actual = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        self.assertEqual(store._stored_bytes(conn), actual)
+        return actual
+
+
+class StoredBytesTest(StoreTestCase):
+
+    def test_total_tracks_insert_and_overwrite(self):
+        store = ResultStore(self.path)
+        store.put("get_weather", {"city": "Delhi"}, {"temp": 30}, 60)
+        store.put("get_weather", {"city": "Paris"}, {"temp": 18}, 60)
+        first = self.assertTotalMatches(store)
+
+        # Overwriting with a larger value must replace, not add to, the old size
+        store.put("get_weather", {"city": "Delhi"}, {"temp": 30, "notes": "y" * 500}, 60)
+        self.assertGreater(self.assertTotalMatches(store), first)
+        self.assertEqual(store.stats()["entries"], 2)
+
+    def test_total_tracks_eviction(self):
+        store = ResultStore(self.path, max_bytes=5_000)
+        for i in range(100):
+            store.put("get_news", {"query": f"q{i}"}, {"text": "z" * 200}, 60 + i)
+        self.assertGreater(store.evictions, 0)
+        self.assertLessEqual(self.assertTotalMatches(store), store.max_bytes)
+
+    def test_total_holds_with_concurrent_processes(self):
+        ResultStore(self.path)
+        workers = [multiprocessing.Process(target=write_many, args=(self.path, n)) for n in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            self.assertEqual(worker.exitcode, 0)
+        self.assertTotalMatches(ResultStore(self.path))
+
+
+class EvictionTest(StoreTestCase):
+
+    def test_expired_entries_go_first(self):
+        store = ResultStore(self.path, max_bytes=10_000)
+        small = {"blob": os.urandom(500)}
+        store.put("get_news", {"query": "stale"}, {"blob": os.urandom(5000)}, 0.01)
+        store.put("get_news", {"query": "soon"}, small, 100)
+        store.put("get_news", {"query": "later"}, small, 1000)
+        time.sleep(0.05)
+
+        # Push the store just over max_bytes; dropping the expired entry is enough
+        conn = store._connect()
+        fill = (store.max_bytes - store._stored_bytes(conn)) // len(encode_result(small)) + 1
+        for i in range(fill):
+            store.put("get_news", {"query": f"fill{i}"}, small, 5000)
+
+        keys = {row[0] for row in conn.execute("SELECT key FROM results")}
+        self.assertNotIn(make_store_key("get_news", {"query": "stale"}), keys)
+        self.assertIn(make_store_key("get_news", {"query": "soon"}), keys)
+        self.assertIn(make_store_key("get_news", {"query": "later"}), keys)
+        self.assertEqual(store.evictions, 1)
+        self.assertTotalMatches(store)
+
+    def test_soonest_expiring_evicted_when_nothing_expired(self):
+        store = ResultStore(self.path, max_bytes=5_000)
+        for i in range(20):
+            store.put("get_news", {"query": f"q{i}"}, {"blob": os.urandom(500)}, 100 + i)
+        keys = {row[0] for row in store._connect().execute("SELECT key FROM results")}
+        self.assertNotIn(make_store_key("get_news", {"query": "q0"}), keys)
+        self.assertIn(make_store_key("get_news", {"query": "q19"}), keys)
+
+
+class EncodingTest(StoreTestCase):
+
+    def test_round_trip_raw_and_compressed(self):
+        for value in ({"small": 1}, {"large": "c" * 5000}):
+            self.assertEqual(decode_result(encode_result(value)), value)
+
+    def test_other_marshal_version_is_a_miss(self):
+        store = ResultStore(self.path)
+        store.put("get_weather", {"city": "Delhi"}, {"temp": 30}, 60)
+        blob = bytearray(encode_result({"temp": 30}))
+        blob[1] = (marshal.version + 1) % 256
+        self.assertIsNone(decode_result(bytes(blob)))
+
+        store._connect().execute("UPDATE results SET value = ?", (bytes(blob),))
+        self.assertIsNone(store.get("get_weather", {"city": "Delhi"}))
+        self.assertEqual(store.misses, 1)
+
+
+class UpgradeTest(StoreTestCase):
+
+    def test_total_seeded_from_existing_rows(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE results (key TEXT PRIMARY KEY, tool TEXT NOT NULL, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO results VALUES (?, 'get_news', x'00', ?, 0, 1e12)",
+            [("a", 700), ("b", 300)]
+        )
+        conn.commit()
+        conn.close()
+
+        store = ResultStore(self.path)
+        self.assertEqual(store.stats()["stored_bytes"], 1000)
+        store.put("get_news", {"query": "new"}, {"text": "n"}, 60)
+        self.assertTotalMatches(store)
+
+        # Reopening must not seed the total a second time
+        self.assertEqual(ResultStore(self.path).stats()["stored_bytes"], store.stats()["stored_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()